@@ -2,42 +2,50 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
-import re
-from typing import Any
 
 import voluptuous as vol
 
 from homeassistant.components.http import StaticPathConfig
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_PORT, CONF_USERNAME
 from homeassistant.core import HomeAssistant, ServiceCall, callback
-from homeassistant.helpers import (
-    config_validation as cv,
-    device_registry as dr,
-    entity_registry as er,
-)
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.storage import Store
 
+from . import ssh_pool
 from .const import (
     ATTR_PORT,
-    CONF_AUTH_METHOD,
-    CONF_SSH_KEY_PASSPHRASE,
-    CONF_SSH_KEY_PATH,
     CONF_STARTUP_LIGHTWEIGHT_READ,
-    AUTH_METHOD_KEY,
+    DATA_BY_DEVICE_ID,
+    DATA_COORDINATORS,
     DOMAIN,
     PLATFORMS,
     SERVICE_RUN_CABLE_TEST,
+    STORAGE_KEY,
+    STORAGE_VERSION,
 )
 from .coordinator import UniFiCableTesterCoordinator
-from .ssh_client import UniFiSSHClient
 
 _LOGGER = logging.getLogger(__name__)
 
 # Frontend card path
 CARD_NAME = "unifi-cable-tester-card.js"
 CARD_URL_PATH = f"/{DOMAIN}/{CARD_NAME}"
+# Resolved at import time (off the event loop) so setup does no filesystem I/O
+_CARD_PATH = Path(__file__).parent / "www" / CARD_NAME
+_CARD_EXISTS = _CARD_PATH.is_file()
+
+# Built once at import and shared by every service registration
+SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_PORT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=52)
+        ),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
@@ -45,12 +53,10 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     hass.data.setdefault(DOMAIN, {})
 
     # Register the static path for our custom card
-    card_path = Path(__file__).parent / "www" / CARD_NAME
-
-    if card_path.exists():
+    if _CARD_EXISTS:
         try:
             await hass.http.async_register_static_paths(
-                [StaticPathConfig(CARD_URL_PATH, str(card_path), cache_headers=False)]
+                [StaticPathConfig(CARD_URL_PATH, str(_CARD_PATH), cache_headers=False)]
             )
             _LOGGER.info(
                 "UniFi Cable Tester card registered. Add to Lovelace resources: %s",
@@ -59,44 +65,52 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         except Exception as err:
             _LOGGER.warning("Failed to register frontend card: %s", err)
     else:
-        _LOGGER.debug("Frontend card not found at %s", card_path)
+        _LOGGER.debug("Frontend card not found at %s", _CARD_PATH)
 
     return True
 
 
-def _create_client(data: dict) -> UniFiSSHClient:
-    """Create an SSH client from config entry data."""
-    kwargs: dict = {
-        "host": data[CONF_HOST],
-        "port": data.get(CONF_PORT, 22),
-        "username": data.get(CONF_USERNAME, "admin"),
-    }
+def _scan_ports(unique_ids: list[str]) -> int:
+    """Return the highest port number embedded in a list of unique IDs."""
+    max_port = 0
+    for unique_id in unique_ids:
+        # Unique IDs look like "<entry_id>_port_<N>_<suffix>"
+        _, sep, rest = unique_id.partition("_port_")
+        if sep:
+            num, _, _ = rest.partition("_")
+            if num.isdecimal():
+                max_port = max(max_port, int(num))
+    return max_port
 
-    if data.get(CONF_AUTH_METHOD) == AUTH_METHOD_KEY:
-        kwargs["ssh_key_path"] = data[CONF_SSH_KEY_PATH]
-        kwargs["ssh_key_passphrase"] = data.get(CONF_SSH_KEY_PASSPHRASE)
-    else:
-        kwargs["password"] = data.get(CONF_PASSWORD)
 
-    return UniFiSSHClient(**kwargs)
+@callback
+def _discover_known_ports(hass: HomeAssistant, entry: ConfigEntry) -> int:
+    """Return the highest port number among this entry's existing entities."""
+    registry = er.async_get(hass)
+    return _scan_ports(
+        [
+            entity_entry.unique_id
+            for entity_entry in er.async_entries_for_config_entry(
+                registry, entry.entry_id
+            )
+            if entity_entry.unique_id
+        ]
+    )
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up UniFi Cable Tester from a config entry."""
-    client = _create_client(entry.data)
+    # Picks up the connection left warm by the config flow, if any
+    client = ssh_pool.take(entry.data)
     coordinator = UniFiCableTesterCoordinator(hass, entry, client)
 
-    # Reuse known port count from existing entities if available.
-    registry = er.async_get(hass)
-    known_ports: set[int] = set()
-    for entity_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
-        if not entity_entry.unique_id:
-            continue
-        match = re.search(r"_port_(\d+)_", entity_entry.unique_id)
-        if match:
-            known_ports.add(int(match.group(1)))
-    if known_ports:
-        coordinator.port_count = max(known_ports)
+    # Port count and switch identity don't change for a given switch, so
+    # reuse what a previous setup of this host saved in the coordinator's
+    # Store when available, otherwise fall back to scanning existing
+    # entities for the port count.
+    stored_switch_info = await coordinator.async_load_stored()
+    if coordinator.port_count <= 0:
+        coordinator.port_count = _discover_known_ports(hass, entry)
 
     startup_lightweight_read = bool(
         entry.options.get(
@@ -107,32 +121,31 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Connect and discover ports
     await coordinator.async_setup(
-        startup_lightweight_read=startup_lightweight_read
+        startup_lightweight_read=startup_lightweight_read,
+        stored_switch_info=stored_switch_info,
     )
 
     # Store coordinator
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    domain_data.setdefault(DATA_COORDINATORS, {})[entry.entry_id] = coordinator
 
     # Forward setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Index the coordinator by its device so targeted service calls can
+    # dispatch without walking the device registry.
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, entry.entry_id)}
+    )
+    if device is not None:
+        domain_data.setdefault(DATA_BY_DEVICE_ID, {})[device.id] = coordinator
+
     # Register services (only once for the domain)
     _async_register_services(hass)
 
     return True
 
 
-SERVICE_SCHEMA = vol.Schema(
-    {
-        vol.Optional(ATTR_PORT): vol.All(
-            vol.Coerce(int), vol.Range(min=1, max=52)
-        ),
-    },
-    extra=vol.ALLOW_EXTRA,
-)
-
-
 @callback
 def _async_register_services(hass: HomeAssistant) -> None:
     """Register integration services."""
@@ -141,33 +154,56 @@ def _async_register_services(hass: HomeAssistant) -> None:
 
     async def async_handle_cable_test(call: ServiceCall) -> None:
         """Handle run_cable_test service call."""
+        domain_data = hass.data.get(DOMAIN)
+        if not domain_data or not domain_data.get(DATA_COORDINATORS):
+            return
+        by_entry_id: dict[str, UniFiCableTesterCoordinator] = domain_data[
+            DATA_COORDINATORS
+        ]
+
         port: int | None = call.data.get(ATTR_PORT)
-        device_ids: set[str] = set()
+        # Collect target device IDs from service data (a single ID or a list)
+        raw_ids = call.data.get("device_id") or ()
+        device_ids: set[str] = set(
+            (raw_ids,) if isinstance(raw_ids, str) else raw_ids
+        )
 
-        # Collect target device IDs from service data
-        raw_ids = call.data.get("device_id")
-        if raw_ids:
-            device_ids.update(
-                raw_ids if isinstance(raw_ids, list) else [raw_ids]
-            )
+        # A set, so a switch targeted via several devices is only tested once
+        coordinators: set[UniFiCableTesterCoordinator] = set()
 
         if not device_ids:
             # No specific device targeted — run on all configured switches
-            for coordinator in hass.data.get(DOMAIN, {}).values():
-                if isinstance(coordinator, UniFiCableTesterCoordinator):
-                    await coordinator.async_request_cable_test(port)
-            return
-
-        # Map device IDs back to coordinators
-        device_reg = dr.async_get(hass)
-        for device_id in device_ids:
-            device_entry = device_reg.async_get(device_id)
-            if device_entry is None:
-                continue
-            for entry_id in device_entry.config_entries:
-                coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
-                if isinstance(coordinator, UniFiCableTesterCoordinator):
-                    await coordinator.async_request_cable_test(port)
+            coordinators.update(by_entry_id.values())
+        else:
+            # Map device IDs back to coordinators
+            by_device_id = domain_data.get(DATA_BY_DEVICE_ID, {})
+            device_reg = dr.async_get(hass)
+            for device_id in device_ids:
+                coordinator = by_device_id.get(device_id)
+                if coordinator is not None:
+                    coordinators.add(coordinator)
+                    continue
+
+                # Fall back to the device registry for devices not yet indexed
+                device_entry = device_reg.async_get(device_id)
+                if device_entry is None:
+                    continue
+                for entry_id in device_entry.config_entries:
+                    coordinator = by_entry_id.get(entry_id)
+                    if coordinator is not None:
+                        coordinators.add(coordinator)
+
+        # Test switches concurrently; each coordinator serializes its own tests
+        results = await asyncio.gather(
+            *(
+                coordinator.async_request_cable_test(port)
+                for coordinator in coordinators
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
 
     hass.services.async_register(
         DOMAIN,
@@ -182,7 +218,24 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        coordinator: UniFiCableTesterCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        domain_data = hass.data[DOMAIN]
+        coordinator: UniFiCableTesterCoordinator = domain_data[DATA_COORDINATORS].pop(
+            entry.entry_id
+        )
+        by_device_id = domain_data.get(DATA_BY_DEVICE_ID, {})
+        for device_id in [
+            device_id
+            for device_id, indexed in by_device_id.items()
+            if indexed is coordinator
+        ]:
+            del by_device_id[device_id]
         await coordinator.async_shutdown()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted switch details when a config entry is deleted."""
+    await Store(
+        hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id)
+    ).async_remove()
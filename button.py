@@ -11,7 +11,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import DATA_COORDINATORS, DOMAIN
 from .coordinator import UniFiCableTesterCoordinator
 from .entity import UniFiCableTesterEntity
 
@@ -24,7 +24,9 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up UniFi cable test buttons."""
-    coordinator: UniFiCableTesterCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator: UniFiCableTesterCoordinator = hass.data[DOMAIN][DATA_COORDINATORS][
+        entry.entry_id
+    ]
 
     entities: list[ButtonEntity] = [
         # "Test All Cables" button
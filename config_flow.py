@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
 import logging
+import time
 from typing import Any
 
 import voluptuous as vol
@@ -10,6 +12,7 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_PORT, CONF_USERNAME
 
+from . import ssh_pool
 from .const import (
     AUTH_METHOD_KEY,
     AUTH_METHOD_PASSWORD,
@@ -21,14 +24,49 @@ from .const import (
     DEFAULT_USERNAME,
     DOMAIN,
 )
-from .ssh_client import (
-    UniFiAuthError,
-    UniFiConnectionError,
-    UniFiSSHClient,
-)
+from .ssh_client import UniFiAuthError, UniFiConnectionError
 
 _LOGGER = logging.getLogger(__name__)
 
+# Recent validation outcomes keyed by ssh_pool.pool_key(), oldest first
+_VALIDATION_CACHE: OrderedDict[ssh_pool.PoolKey, tuple[float, str | None]] = (
+    OrderedDict()
+)
+_VALIDATION_CACHE_SIZE = 5
+_VALIDATION_CACHE_TTL = 30.0
+
+_AUTH_METHOD_CHOICES = {
+    AUTH_METHOD_PASSWORD: "Password",
+    AUTH_METHOD_KEY: "SSH Key",
+}
+
+# Static form schemas, built once at import
+_USER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_HOST): str,
+        vol.Required(CONF_PORT, default=DEFAULT_SSH_PORT): int,
+        vol.Required(CONF_AUTH_METHOD, default=AUTH_METHOD_PASSWORD): vol.In(
+            _AUTH_METHOD_CHOICES
+        ),
+        vol.Optional(CONF_STARTUP_LIGHTWEIGHT_READ, default=False): bool,
+    }
+)
+
+_AUTH_PASSWORD_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_USERNAME, default=DEFAULT_USERNAME): str,
+        vol.Required(CONF_PASSWORD): str,
+    }
+)
+
+_AUTH_KEY_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_USERNAME, default=DEFAULT_USERNAME): str,
+        vol.Required(CONF_SSH_KEY_PATH): str,
+        vol.Optional(CONF_SSH_KEY_PASSPHRASE, default=""): str,
+    }
+)
+
 
 class UniFiCableTesterConfigFlow(
     config_entries.ConfigFlow, domain=DOMAIN
@@ -62,27 +100,15 @@ class UniFiCableTesterConfigFlow(
             await self.async_set_unique_id(user_input[CONF_HOST])
             self._abort_if_unique_id_configured()
 
-            if user_input[CONF_AUTH_METHOD] == AUTH_METHOD_KEY:
-                return await self.async_step_auth_key()
-            return await self.async_step_auth_password()
-
-        schema = vol.Schema(
-            {
-                vol.Required(CONF_HOST): str,
-                vol.Required(CONF_PORT, default=DEFAULT_SSH_PORT): int,
-                vol.Required(CONF_AUTH_METHOD, default=AUTH_METHOD_PASSWORD): vol.In(
-                    {
-                        AUTH_METHOD_PASSWORD: "Password",
-                        AUTH_METHOD_KEY: "SSH Key",
-                    }
-                ),
-                vol.Optional(CONF_STARTUP_LIGHTWEIGHT_READ, default=False): bool,
+            auth_steps = {
+                AUTH_METHOD_PASSWORD: self.async_step_auth_password,
+                AUTH_METHOD_KEY: self.async_step_auth_key,
             }
-        )
+            return await auth_steps[user_input[CONF_AUTH_METHOD]]()
 
         return self.async_show_form(
             step_id="user",
-            data_schema=schema,
+            data_schema=_USER_SCHEMA,
             errors=errors,
         )
 
@@ -105,16 +131,9 @@ class UniFiCableTesterConfigFlow(
                     data=self._data,
                 )
 
-        schema = vol.Schema(
-            {
-                vol.Required(CONF_USERNAME, default=DEFAULT_USERNAME): str,
-                vol.Required(CONF_PASSWORD): str,
-            }
-        )
-
         return self.async_show_form(
             step_id="auth_password",
-            data_schema=schema,
+            data_schema=_AUTH_PASSWORD_SCHEMA,
             errors=errors,
         )
 
@@ -137,17 +156,9 @@ class UniFiCableTesterConfigFlow(
                     data=self._data,
                 )
 
-        schema = vol.Schema(
-            {
-                vol.Required(CONF_USERNAME, default=DEFAULT_USERNAME): str,
-                vol.Required(CONF_SSH_KEY_PATH): str,
-                vol.Optional(CONF_SSH_KEY_PASSPHRASE, default=""): str,
-            }
-        )
-
         return self.async_show_form(
             step_id="auth_key",
-            data_schema=schema,
+            data_schema=_AUTH_KEY_SCHEMA,
             errors=errors,
         )
 
@@ -158,37 +169,18 @@ class UniFiCableTesterConfigFlow(
         errors: dict[str, str] = {}
         entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
         assert entry is not None
-        existing = dict(entry.data)
 
         if user_input is not None:
-            self._data = {**existing, **user_input}
+            self._data = {**entry.data, **user_input}
 
             # Route to the appropriate auth step based on selected method
-            if user_input[CONF_AUTH_METHOD] == AUTH_METHOD_KEY:
-                return await self.async_step_reconfigure_auth_key()
-            return await self.async_step_reconfigure_auth_password()
-
-        schema = vol.Schema(
-            {
-                vol.Required(CONF_HOST, default=existing.get(CONF_HOST, "")): str,
-                vol.Required(
-                    CONF_PORT, default=existing.get(CONF_PORT, DEFAULT_SSH_PORT)
-                ): int,
-                vol.Required(
-                    CONF_AUTH_METHOD,
-                    default=existing.get(CONF_AUTH_METHOD, AUTH_METHOD_PASSWORD),
-                ): vol.In(
-                    {
-                        AUTH_METHOD_PASSWORD: "Password",
-                        AUTH_METHOD_KEY: "SSH Key",
-                    }
-                ),
-                vol.Optional(
-                    CONF_STARTUP_LIGHTWEIGHT_READ,
-                    default=existing.get(CONF_STARTUP_LIGHTWEIGHT_READ, False),
-                ): bool,
+            auth_steps = {
+                AUTH_METHOD_PASSWORD: self.async_step_reconfigure_auth_password,
+                AUTH_METHOD_KEY: self.async_step_reconfigure_auth_key,
             }
-        )
+            return await auth_steps[user_input[CONF_AUTH_METHOD]]()
+
+        schema = self.add_suggested_values_to_schema(_USER_SCHEMA, entry.data)
 
         return self.async_show_form(
             step_id="reconfigure",
@@ -203,12 +195,11 @@ class UniFiCableTesterConfigFlow(
         errors: dict[str, str] = {}
         entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
         assert entry is not None
-        existing = dict(entry.data)
 
         if user_input is not None:
             self._data.update(user_input)
 
-            error = await self._validate_connection(self._data)
+            error = await self._validate_reconfigure(entry)
             if error:
                 errors["base"] = error
             else:
@@ -218,14 +209,10 @@ class UniFiCableTesterConfigFlow(
                     title=f"UniFi Switch ({self._data[CONF_HOST]})",
                 )
 
-        schema = vol.Schema(
-            {
-                vol.Required(
-                    CONF_USERNAME,
-                    default=existing.get(CONF_USERNAME, DEFAULT_USERNAME),
-                ): str,
-                vol.Required(CONF_PASSWORD): str,
-            }
+        # Never pre-fill the stored password
+        schema = self.add_suggested_values_to_schema(
+            _AUTH_PASSWORD_SCHEMA,
+            {CONF_USERNAME: entry.data.get(CONF_USERNAME, DEFAULT_USERNAME)},
         )
 
         return self.async_show_form(
@@ -241,12 +228,11 @@ class UniFiCableTesterConfigFlow(
         errors: dict[str, str] = {}
         entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
         assert entry is not None
-        existing = dict(entry.data)
 
         if user_input is not None:
             self._data.update(user_input)
 
-            error = await self._validate_connection(self._data)
+            error = await self._validate_reconfigure(entry)
             if error:
                 errors["base"] = error
             else:
@@ -256,22 +242,7 @@ class UniFiCableTesterConfigFlow(
                     title=f"UniFi Switch ({self._data[CONF_HOST]})",
                 )
 
-        schema = vol.Schema(
-            {
-                vol.Required(
-                    CONF_USERNAME,
-                    default=existing.get(CONF_USERNAME, DEFAULT_USERNAME),
-                ): str,
-                vol.Required(
-                    CONF_SSH_KEY_PATH,
-                    default=existing.get(CONF_SSH_KEY_PATH, ""),
-                ): str,
-                vol.Optional(
-                    CONF_SSH_KEY_PASSPHRASE,
-                    default=existing.get(CONF_SSH_KEY_PASSPHRASE, ""),
-                ): str,
-            }
-        )
+        schema = self.add_suggested_values_to_schema(_AUTH_KEY_SCHEMA, entry.data)
 
         return self.async_show_form(
             step_id="reconfigure_auth_key",
@@ -279,40 +250,66 @@ class UniFiCableTesterConfigFlow(
             errors=errors,
         )
 
+    async def _validate_reconfigure(
+        self, entry: config_entries.ConfigEntry
+    ) -> str | None:
+        """Validate reconfigured connection details.
+
+        Skips the SSH round-trip when host, port, username and password are
+        identical to what the entry already uses. Key auth is always
+        validated, since the key file may have been replaced at the same path.
+        """
+        if self._data.get(CONF_AUTH_METHOD) != AUTH_METHOD_KEY and (
+            ssh_pool.pool_key(self._data) == ssh_pool.pool_key(entry.data)
+        ):
+            return None
+        return await self._validate_connection(self._data)
+
     async def _validate_connection(self, data: dict[str, Any]) -> str | None:
         """Validate SSH connection to the switch.
 
-        Returns an error key string on failure, or None on success.
+        Returns an error key string on failure, or None on success. Recent
+        outcomes are cached briefly so resubmitting a step doesn't repeat the
+        SSH round-trip.
         """
-        kwargs: dict = {
-            "host": data[CONF_HOST],
-            "port": data.get(CONF_PORT, DEFAULT_SSH_PORT),
-            "username": data.get(CONF_USERNAME, DEFAULT_USERNAME),
-        }
+        key = ssh_pool.pool_key(data)
+        now = time.monotonic()
 
-        if data.get(CONF_AUTH_METHOD) == AUTH_METHOD_KEY:
-            kwargs["ssh_key_path"] = data.get(CONF_SSH_KEY_PATH)
-            kwargs["ssh_key_passphrase"] = data.get(CONF_SSH_KEY_PASSPHRASE) or None
-        else:
-            kwargs["password"] = data.get(CONF_PASSWORD)
+        if (cached := _VALIDATION_CACHE.get(key)) is not None:
+            timestamp, cached_result = cached
+            if now - timestamp < _VALIDATION_CACHE_TTL:
+                _VALIDATION_CACHE.move_to_end(key)
+                return cached_result
+            del _VALIDATION_CACHE[key]
 
-        client = UniFiSSHClient(**kwargs)
+        result = await self._async_check_connection(data)
 
+        # Don't cache unexpected errors so transient failures always retry
+        if result != "unknown":
+            _VALIDATION_CACHE[key] = (now, result)
+            if len(_VALIDATION_CACHE) > _VALIDATION_CACHE_SIZE:
+                _VALIDATION_CACHE.popitem(last=False)
+
+        return result
+
+    async def _async_check_connection(self, data: dict[str, Any]) -> str | None:
+        """Connect to the switch and check it looks like a UniFi switch."""
         try:
-            await client.connect()
-
-            # Verify it's a UniFi switch by running swctrl
-            output = await client.run_command("swctrl port show")
-            if "command not found" in output.lower():
-                return "not_unifi_switch"
-
-            # Try to get port count to fully validate
-            port_count = client._parse_port_count(output)
-            if port_count == 0:
-                _LOGGER.warning(
-                    "Connected but could not determine port count for %s",
-                    data[CONF_HOST],
-                )
+            # Borrow a pooled connection so retries and the subsequent entry
+            # setup can reuse it instead of reconnecting.
+            async with ssh_pool.acquire(data) as client:
+                # Verify it's a UniFi switch by running swctrl
+                output = await client.run_command("swctrl port show")
+                if "command not found" in output.lower():
+                    return "not_unifi_switch"
+
+                # Try to get port count to fully validate
+                port_count = client._parse_port_count(output)
+                if port_count == 0:
+                    _LOGGER.warning(
+                        "Connected but could not determine port count for %s",
+                        data[CONF_HOST],
+                    )
 
             return None
 
@@ -323,8 +320,6 @@ class UniFiCableTesterConfigFlow(
         except Exception:
             _LOGGER.exception("Unexpected error during validation")
             return "unknown"
-        finally:
-            await client.disconnect()
 
 
 class UniFiCableTesterOptionsFlow(config_entries.OptionsFlow):
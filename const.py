@@ -15,6 +15,13 @@ AUTH_METHOD_KEY = "key"
 DEFAULT_SSH_PORT = 22
 DEFAULT_USERNAME = "admin"
 
+# SSH keepalive so the shared connection survives idle periods between tests
+SSH_KEEPALIVE_INTERVAL = 30
+SSH_KEEPALIVE_COUNT_MAX = 3
+# Reconnect once the shared connection reaches this age (seconds), so a
+# session the switch has silently gone stale on is eventually replaced
+SSH_MAX_CONNECTION_AGE = 3600
+
 # SSH commands (shell mode)
 CMD_PORT_SHOW = "swctrl port show"
 CMD_SYSTEM_INFO = "info"
@@ -25,6 +32,14 @@ CMD_CLI_ENTER = "cli"
 CMD_CLI_EXIT = "exit"
 CMD_CABLE_DIAG = "sh cable-diag int gi{port}"
 
+# Storage for switch details discovered on a previous startup
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.{{entry_id}}"
+
+# hass.data keys
+DATA_COORDINATORS = "coordinators"
+DATA_BY_DEVICE_ID = "by_device_id"
+
 # Service constants
 SERVICE_RUN_CABLE_TEST = "run_cable_test"
 ATTR_PORT = "port"
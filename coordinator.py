@@ -3,15 +3,31 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
 import logging
+import sys
+import time
 from datetime import datetime, timezone
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import CONF_HOST
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN, TEST_RUN_COMPLETED, TEST_RUN_FAILED, TEST_RUN_IDLE, TEST_RUN_RUNNING
+from .const import (
+    DOMAIN,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    TEST_RUN_COMPLETED,
+    TEST_RUN_FAILED,
+    TEST_RUN_IDLE,
+    TEST_RUN_RUNNING,
+)
 from .ssh_client import (
     CableTestResult,
     PortStatus,
@@ -25,6 +41,20 @@ from .ssh_client import (
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclasses.dataclass(frozen=True, slots=True)
+class TestRunState:
+    """State of the current or last cable test run."""
+
+    status: str = TEST_RUN_IDLE
+    started: datetime | None = None
+    completed: datetime | None = None
+    ports: int = 0
+    error: str | None = None
+    # Seconds from start to completion, measured on the monotonic clock so
+    # wall-clock adjustments mid-test can't skew it
+    duration: float | None = None
+
+
 class UniFiCableTesterCoordinator(DataUpdateCoordinator[dict[int, CableTestResult]]):
     """Coordinator for UniFi cable test data.
 
@@ -48,39 +78,104 @@ class UniFiCableTesterCoordinator(DataUpdateCoordinator[dict[int, CableTestResul
         self.config_entry = entry
         self.client = client
         self.port_count: int = 0
-        self.switch_info: SwitchInfo = SwitchInfo()
+        # Bit i set for port i (bit 0 unused)
+        self._all_ports_mask: int = 0
+        # The config entry identifier never changes for the coordinator's
+        # lifetime; the MAC-derived ones are rebuilt with switch_info.
+        self._entry_identifiers: frozenset[tuple[str, str]] = frozenset(
+            {(DOMAIN, entry.entry_id)}
+        )
+        self._identifiers: frozenset[tuple[str, str]]
+        self._connections: frozenset[tuple[str, str]]
+        self._device_info: DeviceInfo | None = None
+        self.switch_info = SwitchInfo()
         self.port_statuses: dict[int, PortStatus] = {}
-        self.test_failed_ports: set[int] = set()
+        self._failed_mask: int = 0
         self._test_lock = asyncio.Lock()
+        # The only persisted copy of the port count and switch details,
+        # tagged with the host they were read from (not kept in entry.data)
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id)
+        )
+
+        # Test run status tracking, replaced as a whole on each transition
+        self.test_run: TestRunState = TestRunState()
+        self._test_started_mono: float = 0.0
 
-        # Test run status tracking
-        self.test_run_status: str = TEST_RUN_IDLE
-        self.test_started: datetime | None = None
-        self.test_completed: datetime | None = None
-        self.test_ports_count: int = 0
-        self.test_error_message: str | None = None
+    @property
+    def switch_info(self) -> SwitchInfo:
+        """Return the identity details of the switch."""
+        return self._switch_info
 
-    async def async_setup(self, startup_lightweight_read: bool = False) -> None:
+    @switch_info.setter
+    def switch_info(self, switch_info: SwitchInfo) -> None:
+        """Replace the switch details and drop the cached device info."""
+        self._switch_info = switch_info
+        # Intern the MAC (parsed lowercase) since it is compared against
+        # device registry keys on every registry lookup.
+        if mac := switch_info.mac:
+            mac = sys.intern(mac)
+            self._identifiers = self._entry_identifiers | {(DOMAIN, mac)}
+            self._connections = frozenset({(dr.CONNECTION_NETWORK_MAC, mac)})
+        else:
+            self._identifiers = self._entry_identifiers
+            self._connections = frozenset()
+        self._device_info = None
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device info shared by all entities of this switch."""
+        if self._device_info is None:
+            self._device_info = self._build_device_info()
+        return self._device_info
+
+    def _build_device_info(self) -> DeviceInfo:
+        """Build device info from the current switch details."""
+        switch_info = self._switch_info
+        # Frozensets rather than tuples: the device registry merges these
+        # with set operations (issubset / |), which tuples don't support.
+        return DeviceInfo(
+            identifiers=self._identifiers,
+            connections=self._connections,
+            name=switch_info.hostname,
+            manufacturer="Ubiquiti",
+            model=switch_info.model,
+            sw_version=switch_info.version,
+        )
+
+    @property
+    def failed_port_count(self) -> int:
+        """Return the number of ports whose last cable test failed."""
+        return self._failed_mask.bit_count()
+
+    def is_port_failed(self, port: int) -> bool:
+        """Return True if the last cable test for a port failed."""
+        return bool(self._failed_mask >> port & 1)
+
+    async def async_setup(
+        self,
+        startup_lightweight_read: bool = False,
+        stored_switch_info: SwitchInfo | None = None,
+    ) -> None:
         """Connect to the switch and discover required startup data.
 
         Args:
             startup_lightweight_read: If True, also fetch switch info and port
                 status details during startup.
+            stored_switch_info: Switch details from async_load_stored, reused
+                instead of querying the switch.
         """
         try:
-            await self.client.connect()
-            if self.port_count <= 0:
-                self.port_count = await self.client.get_port_count()
-            else:
-                _LOGGER.debug(
-                    "Skipping startup port discovery, using known port count: %d",
-                    self.port_count,
-                )
-            # Always fetch switch identity (fast, no side-effects)
-            self.switch_info = await self.client.get_switch_info()
-            # Optionally fetch per-port link details (slightly slower)
-            if startup_lightweight_read:
-                self.port_statuses = await self.client.get_port_statuses()
+            # The client may already hold a warm connection from the pool
+            if not self.client.connected:
+                await self.client.connect()
+            # Port discovery and switch info use separate channels on the
+            # same connection, so fetch them concurrently
+            _, self.switch_info = await asyncio.gather(
+                self._async_discover_ports(startup_lightweight_read),
+                self._async_fetch_switch_info(stored_switch_info),
+            )
+            self._all_ports_mask = (1 << (self.port_count + 1)) - 2
             _LOGGER.info(
                 "Connected to %s (%s) with %d ports",
                 self.switch_info.hostname,
@@ -96,9 +191,83 @@ class UniFiCableTesterCoordinator(DataUpdateCoordinator[dict[int, CableTestResul
                 f"Cannot connect to switch: {err}"
             ) from err
 
+        # Persist what was discovered so the next startup can skip scanning
+        # the entity registry and probing the switch.
+        if stored_switch_info is None:
+            await self._async_save_stored()
+
         # Initialize with empty data (no tests run yet)
         self.async_set_updated_data({})
 
+    async def _async_discover_ports(self, fetch_statuses: bool) -> None:
+        """Discover the port count and optionally per-port link details."""
+        if self.port_count <= 0 and fetch_statuses:
+            # Port count and link details come from the same listing
+            (
+                self.port_count,
+                self.port_statuses,
+            ) = await self.client.get_port_count_and_statuses()
+            return
+        if self.port_count <= 0:
+            self.port_count = await self.client.get_port_count()
+        else:
+            _LOGGER.debug(
+                "Skipping startup port discovery, using known port count: %d",
+                self.port_count,
+            )
+        # Optionally fetch per-port link details (slightly slower)
+        if fetch_statuses:
+            self.port_statuses = await self.client.get_port_statuses()
+
+    async def _async_fetch_switch_info(
+        self, stored_switch_info: SwitchInfo | None
+    ) -> SwitchInfo:
+        """Return stored switch details, or fetch them from the switch."""
+        if stored_switch_info is not None:
+            return stored_switch_info
+        return await self.client.get_switch_info()
+
+    async def async_load_stored(self) -> SwitchInfo | None:
+        """Load the port count and switch details saved for this switch.
+
+        Sets port_count if it is not already known and returns the stored
+        SwitchInfo, or None if the switch must be queried again.
+        """
+        stored = await self._store.async_load()
+        # Ignore data saved for a different host (e.g. after reconfigure)
+        if not stored or stored.get("host") != self.config_entry.data[CONF_HOST]:
+            return None
+        if self.port_count <= 0:
+            self.port_count = stored.get("port_count", 0)
+        try:
+            switch_info = SwitchInfo(**stored["switch_info"])
+        except (KeyError, TypeError):
+            return None
+        # Defaults saved before the switch reported its identity, or a
+        # record without a port count, are completed by probing again
+        if not switch_info.mac or not stored.get("port_count"):
+            return None
+        return switch_info
+
+    async def _async_save_stored(self) -> None:
+        """Persist port count and switch details for the next startup.
+
+        Switch details are only stored once the switch actually reported its
+        MAC; defaults left by a failed or partial info read are not, so the
+        next startup probes the switch again.
+        """
+        await self._store.async_save(
+            {
+                "host": self.config_entry.data[CONF_HOST],
+                "port_count": self.port_count,
+                "switch_info": (
+                    dataclasses.asdict(self.switch_info)
+                    if self.switch_info.mac
+                    else None
+                ),
+            }
+        )
+
     async def async_shutdown(self) -> None:
         """Disconnect from the switch."""
         await self.client.disconnect()
@@ -113,10 +282,16 @@ class UniFiCableTesterCoordinator(DataUpdateCoordinator[dict[int, CableTestResul
         This is a lightweight refresh and does not run cable tests.
         """
         try:
-            self.switch_info = await self.client.get_switch_info()
-            self.port_statuses = await self.client.get_port_statuses()
+            # Independent commands on separate channels of one connection
+            switch_info, self.port_statuses = await asyncio.gather(
+                self.client.get_switch_info(),
+                self.client.get_port_statuses(),
+            )
+            if switch_info != self.switch_info:
+                self.switch_info = switch_info
+                await self._async_save_stored()
             # Notify entities so attributes/device info refresh immediately.
-            self.async_set_updated_data(dict(self.data or {}))
+            self.async_update_listeners()
         except UniFiConnectionError as err:
             _LOGGER.error("Connection lost during status refresh: %s", err)
             raise UpdateFailed(f"Connection lost: {err}") from err
@@ -130,14 +305,17 @@ class UniFiCableTesterCoordinator(DataUpdateCoordinator[dict[int, CableTestResul
         Args:
             port: Specific port to test, or None for all ports.
         """
+        tested_mask = 1 << port if port is not None else self._all_ports_mask
+
         async with self._test_lock:
             # Update test run status to running
-            self.test_run_status = TEST_RUN_RUNNING
-            self.test_started = datetime.now(timezone.utc)
-            self.test_completed = None
-            self.test_error_message = None
-            self.test_ports_count = 1 if port is not None else self.port_count
-            self.async_set_updated_data(dict(self.data or {}))
+            self._test_started_mono = time.monotonic()
+            self.test_run = TestRunState(
+                status=TEST_RUN_RUNNING,
+                started=datetime.now(timezone.utc),
+                ports=1 if port is not None else self.port_count,
+            )
+            self.async_update_listeners()
 
             try:
                 # Run the cable test (CLI mode runs and returns results in one call)
@@ -146,63 +324,65 @@ class UniFiCableTesterCoordinator(DataUpdateCoordinator[dict[int, CableTestResul
                     port_count=self.port_count,
                 )
 
-                # Refresh link/speed/type details
+                # Refresh link/speed/type details. Not read alongside the
+                # test: cable diagnostics briefly drop the link, so ports
+                # would read as down mid-test.
                 self.port_statuses = await self.client.get_port_statuses()
+            except (
+                UniFiConnectionError,
+                UniFiCommandError,
+                asyncio.TimeoutError,
+            ) as err:
+                self._async_mark_test_failed(tested_mask, str(err))
+                _LOGGER.error("Cable test failed: %s", err)
+                raise UpdateFailed(f"Cable test failed: {err}") from err
+            except Exception as err:
+                self._async_mark_test_failed(tested_mask, str(err))
+                _LOGGER.exception("Unexpected error during cable test")
+                raise UpdateFailed(f"Cable test failed: {err}") from err
 
-                # Merge with existing data (in case we only tested one port)
-                merged = dict(self.data or {})
-                merged.update(results)
-
-                # Clear any previous failures for tested ports
-                tested_ports = (
-                    {port} if port is not None
-                    else set(range(1, self.port_count + 1))
-                )
-                self.test_failed_ports -= tested_ports
-
-                # If we got no results at all, treat as a failure
-                if not results:
-                    _LOGGER.warning(
-                        "Cable test returned no results for %s",
-                        f"port {port}" if port else "all ports",
-                    )
-                    self.test_failed_ports |= tested_ports
-                    self.async_set_updated_data(dict(self.data or {}))
-                    raise UpdateFailed("Cable test returned no results")
-
-                # Update test run status to completed
-                self.test_run_status = TEST_RUN_COMPLETED
-                self.test_completed = datetime.now(timezone.utc)
-                self.test_ports_count = len(results)
-
-                # Push updated data to all entities (including test run status)
-                self.async_set_updated_data(merged)
-
-                _LOGGER.debug(
-                    "Cable test complete for %s, %d port results",
+            # If we got no results at all, treat as a failure
+            if not results:
+                _LOGGER.warning(
+                    "Cable test returned no results for %s",
                     f"port {port}" if port else "all ports",
-                    len(results),
                 )
+                self._async_mark_test_failed(tested_mask, "No results returned")
+                raise UpdateFailed("Cable test returned no results")
 
-            except UpdateFailed:
-                self.test_run_status = TEST_RUN_FAILED
-                self.test_completed = datetime.now(timezone.utc)
-                self.test_error_message = "No results returned"
-                self.async_set_updated_data(dict(self.data or {}))
-                raise
-            except Exception as err:
-                # Mark the tested port(s) as failed and notify entities
-                failed_ports = (
-                    {port} if port is not None
-                    else set(range(1, self.port_count + 1))
-                )
-                self.test_failed_ports |= failed_ports
+            # Merge with existing data (in case we only tested one port)
+            merged = {**(self.data or {}), **results}
 
-                # Update test run status to failed
-                self.test_run_status = TEST_RUN_FAILED
-                self.test_completed = datetime.now(timezone.utc)
-                self.test_error_message = str(err)
+            # Clear any previous failures for tested ports
+            self._failed_mask &= ~tested_mask
 
-                self.async_set_updated_data(dict(self.data or {}))
-                _LOGGER.error("Cable test failed: %s", err)
-                raise UpdateFailed(f"Cable test failed: {err}") from err
+            # Update test run status to completed
+            self.test_run = dataclasses.replace(
+                self.test_run,
+                status=TEST_RUN_COMPLETED,
+                completed=datetime.now(timezone.utc),
+                ports=len(results),
+                duration=time.monotonic() - self._test_started_mono,
+            )
+
+            # Push updated data to all entities (including test run status)
+            self.async_set_updated_data(merged)
+
+            _LOGGER.debug(
+                "Cable test complete for %s, %d port results",
+                f"port {port}" if port else "all ports",
+                len(results),
+            )
+
+    @callback
+    def _async_mark_test_failed(self, tested_mask: int, message: str) -> None:
+        """Record a failed test run for the tested ports and notify entities."""
+        self._failed_mask |= tested_mask
+        self.test_run = dataclasses.replace(
+            self.test_run,
+            status=TEST_RUN_FAILED,
+            completed=datetime.now(timezone.utc),
+            error=message,
+            duration=time.monotonic() - self._test_started_mono,
+        )
+        self.async_update_listeners()
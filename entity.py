@@ -2,33 +2,39 @@
 
 from __future__ import annotations
 
-from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.device_registry import DeviceInfo
+from typing import Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
 from .coordinator import UniFiCableTesterCoordinator
 
 
 class UniFiCableTesterEntity(CoordinatorEntity[UniFiCableTesterCoordinator]):
     """Base entity for UniFi Cable Tester integration."""
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info to link this entity to the switch device."""
-        identifiers = {(DOMAIN, self.coordinator.config_entry.entry_id)}
-        connections: set[tuple[str, str]] = set()
-
-        if self.coordinator.switch_info.mac:
-            mac = self.coordinator.switch_info.mac.lower()
-            identifiers.add((DOMAIN, mac))
-            connections.add((dr.CONNECTION_NETWORK_MAC, mac))
-
-        return DeviceInfo(
-            identifiers=identifiers,
-            connections=connections,
-            name=self.coordinator.switch_info.hostname,
-            manufacturer="Ubiquiti",
-            model=self.coordinator.switch_info.model,
-            sw_version=self.coordinator.switch_info.version,
-        )
+    _last_fingerprint: tuple[Any, ...] | None = None
+
+    def __init__(self, coordinator: UniFiCableTesterCoordinator) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        # Home Assistant only reads device info when the entity is added to
+        # link it to the switch device, so a snapshot of the coordinator's
+        # shared DeviceInfo is enough.
+        self._attr_device_info = coordinator.device_info
+
+    def _state_fingerprint(self) -> tuple[Any, ...] | None:
+        """Return the values the entity's state is derived from.
+
+        Entities that return None are written on every coordinator update.
+        """
+        return None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if something the entity shows has changed."""
+        fingerprint = self._state_fingerprint()
+        if fingerprint is not None and fingerprint == self._last_fingerprint:
+            return
+        self._last_fingerprint = fingerprint
+        super()._handle_coordinator_update()
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from itertools import chain
+from types import MappingProxyType
 from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
@@ -30,6 +33,7 @@ from .const import (
     ATTR_TEST_COMPLETED,
     ATTR_TEST_DURATION,
     ATTR_TEST_STARTED,
+    DATA_COORDINATORS,
     DOMAIN,
     STATUS_FIBER,
     STATUS_NOT_TESTED,
@@ -41,6 +45,30 @@ from .const import (
 )
 from .coordinator import UniFiCableTesterCoordinator
 from .entity import UniFiCableTesterEntity
+from .ssh_client import CableTestResult, PortStatus
+
+# Per-pair attribute names: (status, length) for pairs 1-4
+_PAIR_KEYS = (
+    ATTR_PAIR_1_STATUS,
+    ATTR_PAIR_1_LENGTH,
+    ATTR_PAIR_2_STATUS,
+    ATTR_PAIR_2_LENGTH,
+    ATTR_PAIR_3_STATUS,
+    ATTR_PAIR_3_LENGTH,
+    ATTR_PAIR_4_STATUS,
+    ATTR_PAIR_4_LENGTH,
+)
+
+# Link attributes for a port with no status yet, shared (read-only) by all
+# port sensors until the first "Refresh Switch Status"
+_EMPTY_PORT_ATTRS: Mapping[str, Any] = MappingProxyType(
+    {
+        ATTR_PORT_CONNECTED: None,
+        ATTR_PORT_SPEED: None,
+        ATTR_PORT_SPEED_MBPS: None,
+        ATTR_PORT_TYPE: None,
+    }
+)
 
 
 async def async_setup_entry(
@@ -49,7 +77,9 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up UniFi cable test sensors."""
-    coordinator: UniFiCableTesterCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator: UniFiCableTesterCoordinator = hass.data[DOMAIN][DATA_COORDINATORS][
+        entry.entry_id
+    ]
 
     entities: list[SensorEntity] = [
         # Test run status sensor
@@ -62,6 +92,8 @@ async def async_setup_entry(
         for port in range(1, coordinator.port_count + 1)
     )
 
+    # State comes from the coordinator's data, so there is nothing to fetch
+    # per entity before adding (update_before_add stays False)
     async_add_entities(entities)
 
 
@@ -74,39 +106,45 @@ class UniFiTestRunStatusSensor(UniFiCableTesterEntity, SensorEntity):
     def __init__(self, coordinator: UniFiCableTesterCoordinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._attr_unique_id = (
-            f"{coordinator.config_entry.entry_id}_test_run_status"
-        )
+        entry_id = coordinator.config_entry.entry_id
+        self._attr_unique_id = f"{entry_id}_test_run_status"
         self._attr_name = "Test Run Status"
 
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Return the values the test run state is derived from."""
+        coordinator = self.coordinator
+        return (
+            coordinator.last_update_success,
+            coordinator.test_run,
+            coordinator.failed_port_count,
+        )
+
     @property
     def native_value(self) -> str:
         """Return the current test run status."""
-        return self.coordinator.test_run_status
+        return self.coordinator.test_run.status
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return test run details as attributes."""
+        coordinator = self.coordinator
         attrs: dict[str, Any] = {}
+        test_run = coordinator.test_run
 
-        if self.coordinator.test_started:
-            attrs[ATTR_TEST_STARTED] = self.coordinator.test_started.isoformat()
+        if test_run.started:
+            attrs[ATTR_TEST_STARTED] = test_run.started.isoformat()
 
-        if self.coordinator.test_completed:
-            attrs[ATTR_TEST_COMPLETED] = self.coordinator.test_completed.isoformat()
+        if test_run.completed:
+            attrs[ATTR_TEST_COMPLETED] = test_run.completed.isoformat()
 
-            # Calculate duration if both timestamps exist
-            if self.coordinator.test_started:
-                duration = (
-                    self.coordinator.test_completed - self.coordinator.test_started
-                ).total_seconds()
-                attrs[ATTR_TEST_DURATION] = round(duration, 1)
+        if test_run.duration is not None:
+            attrs[ATTR_TEST_DURATION] = round(test_run.duration, 1)
 
-        attrs[ATTR_PORTS_TESTED] = self.coordinator.test_ports_count
-        attrs[ATTR_PORTS_FAILED] = len(self.coordinator.test_failed_ports)
+        attrs[ATTR_PORTS_TESTED] = test_run.ports
+        attrs[ATTR_PORTS_FAILED] = coordinator.failed_port_count
 
-        if self.coordinator.test_error_message:
-            attrs[ATTR_ERROR_MESSAGE] = self.coordinator.test_error_message
+        if test_run.error:
+            attrs[ATTR_ERROR_MESSAGE] = test_run.error
 
         return attrs
 
@@ -115,6 +153,12 @@ class UniFiCableTestSensor(UniFiCableTesterEntity, SensorEntity):
     """Sensor showing cable test status for a switch port."""
 
     _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:ethernet-cable"
+    _cached_native_value: str | None = None
+    _port_attrs: Mapping[str, Any] | None = None
+    _port_attrs_source: PortStatus | None = None
+    _result_attrs: dict[str, Any] | None = None
+    _result_attrs_source: CableTestResult | None = None
 
     def __init__(
         self,
@@ -124,90 +168,131 @@ class UniFiCableTestSensor(UniFiCableTesterEntity, SensorEntity):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._port = port
-        self._attr_unique_id = (
-            f"{coordinator.config_entry.entry_id}_port_{port}_cable_status"
-        )
+        entry_id = coordinator.config_entry.entry_id
+        self._attr_unique_id = f"{entry_id}_port_{port}_cable_status"
         self._attr_name = f"Port {port} Cable Status"
 
-    @property
-    def icon(self) -> str:
-        """Return icon based on port type."""
-        # Check if this port returned Fiber in cable test
-        if self.coordinator.data and self._port in self.coordinator.data:
-            result = self.coordinator.data[self._port]
-            if result.pair_1_status == STATUS_FIBER:
-                return "mdi:fiber-manual-record"  # Fiber optic icon
-        return "mdi:ethernet-cable"
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Drop the cached status before deciding whether to write state."""
+        self._cached_native_value = None
+        # Pick the icon from the port type seen in the last cable test
+        data = self.coordinator.data
+        result = data.get(self._port) if data else None
+        if result is not None and result.statuses[0] == STATUS_FIBER:
+            self._attr_icon = "mdi:fiber-manual-record"  # Fiber optic icon
+        else:
+            self._attr_icon = "mdi:ethernet-cable"
+        super()._handle_coordinator_update()
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Return the values this port's state and attributes derive from."""
+        coordinator = self.coordinator
+        data = coordinator.data
+        port = self._port
+        return (
+            coordinator.last_update_success,
+            self.native_value,
+            coordinator.port_statuses.get(port),
+            data.get(port) if data else None,
+        )
 
     @property
     def native_value(self) -> str:
         """Return the overall cable status for this port."""
-        if self._port in self.coordinator.test_failed_ports:
+        # Only changes when the coordinator notifies us
+        if self._cached_native_value is None:
+            self._cached_native_value = self._compute_native_value()
+        return self._cached_native_value
+
+    def _compute_native_value(self) -> str:
+        """Derive the overall cable status from the per-pair results."""
+        coordinator = self.coordinator
+        port = self._port
+        if coordinator.is_port_failed(port):
             return STATUS_TEST_FAILED
-        if not self.coordinator.data or self._port not in self.coordinator.data:
+        data = coordinator.data
+        if not data or port not in data:
             return STATUS_NOT_TESTED
 
-        result = self.coordinator.data[self._port]
-        statuses = [
-            result.pair_1_status,
-            result.pair_2_status,
-            result.pair_3_status,
-            result.pair_4_status,
-        ]
+        result = data[port]
+
+        # Classify all four pairs in one pass
+        fiber = ok = not_tested = 0
+        has_open = False
+        for status in result.statuses:
+            if status == STATUS_SHORT:
+                # Short is always bad and rules out an all-fiber result
+                return STATUS_SHORT
+            if status == STATUS_OPEN:
+                has_open = True
+            elif status == STATUS_FIBER:
+                fiber += 1
+            elif status == STATUS_OK:
+                ok += 1
+            elif status == STATUS_NOT_TESTED:
+                not_tested += 1
 
         # Fiber ports return Fiber status for all pairs
-        if all(s == STATUS_FIBER for s in statuses):
+        if fiber == 4:
             return STATUS_FIBER
-
-        # Check for problems first (Short/Open are always bad)
-        if STATUS_SHORT in statuses:
-            return STATUS_SHORT
-        if STATUS_OPEN in statuses:
+        if has_open:
             return STATUS_OPEN
 
-        # Filter out "Not Tested" pairs (100Mbps only uses pairs A/B)
-        tested_statuses = [s for s in statuses if s != STATUS_NOT_TESTED]
-
-        # If we have tested pairs and all are OK, the cable is good
-        if tested_statuses and all(s == STATUS_OK for s in tested_statuses):
-            return STATUS_OK
-
         # No pairs tested yet
-        if not tested_statuses:
+        if not_tested == 4:
             return STATUS_NOT_TESTED
 
+        # Ignoring "Not Tested" pairs (100Mbps only uses pairs A/B), the
+        # cable is good if every tested pair is OK
+        if ok + not_tested == 4:
+            return STATUS_OK
+
         return STATUS_UNKNOWN
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def extra_state_attributes(self) -> Mapping[str, Any]:
         """Return per-pair cable test details as attributes."""
-        attrs: dict[str, Any] = {}
-
-        port_status = self.coordinator.port_statuses.get(self._port)
+        coordinator = self.coordinator
+        port = self._port
+        data = coordinator.data
+
+        # Link details and test results change independently (status refresh
+        # vs. cable test), and both sources are replaced rather than mutated,
+        # so each half is rebuilt only when its source object changes.
+        port_status = coordinator.port_statuses.get(port)
+        if self._port_attrs is None or port_status is not self._port_attrs_source:
+            self._port_attrs = self._build_port_attrs(port_status)
+            self._port_attrs_source = port_status
+
+        result = data.get(port) if data else None
+        if result is None:
+            return self._port_attrs
+        if result is not self._result_attrs_source:
+            self._result_attrs = self._build_result_attrs(result)
+            self._result_attrs_source = result
+
+        return {**self._port_attrs, **self._result_attrs}
+
+    @staticmethod
+    def _build_port_attrs(port_status: PortStatus | None) -> Mapping[str, Any]:
+        """Build the link detail attributes for a port."""
         # Always include port status keys so they're visible in the attribute panel
         # even before a "Refresh Switch Status" has been triggered.
-        attrs[ATTR_PORT_CONNECTED] = port_status.connected if port_status else None
-        attrs[ATTR_PORT_SPEED] = port_status.speed_display if port_status else None
-        attrs[ATTR_PORT_SPEED_MBPS] = port_status.speed_mbps if port_status else None
-
-        # Set port type from port status if available
-        attrs[ATTR_PORT_TYPE] = port_status.port_type if port_status else None
-
-        if not self.coordinator.data or self._port not in self.coordinator.data:
-            return attrs
-
-        result = self.coordinator.data[self._port]
-        attrs.update(
-            {
-            ATTR_PAIR_1_STATUS: result.pair_1_status,
-            ATTR_PAIR_1_LENGTH: result.pair_1_length,
-            ATTR_PAIR_2_STATUS: result.pair_2_status,
-            ATTR_PAIR_2_LENGTH: result.pair_2_length,
-            ATTR_PAIR_3_STATUS: result.pair_3_status,
-            ATTR_PAIR_3_LENGTH: result.pair_3_length,
-            ATTR_PAIR_4_STATUS: result.pair_4_status,
-            ATTR_PAIR_4_LENGTH: result.pair_4_length,
+        if port_status is None:
+            return _EMPTY_PORT_ATTRS
+        return {
+            ATTR_PORT_CONNECTED: port_status.connected,
+            ATTR_PORT_SPEED: port_status.speed_display,
+            ATTR_PORT_SPEED_MBPS: port_status.speed_mbps,
+            ATTR_PORT_TYPE: port_status.port_type,
+        }
+
+    @staticmethod
+    def _build_result_attrs(result: CableTestResult) -> dict[str, Any]:
+        """Build the per-pair attributes for a cable test result."""
+        pair_values = chain.from_iterable(zip(result.statuses, result.lengths))
+        return {
+            **dict(zip(_PAIR_KEYS, pair_values)),
             ATTR_LAST_TESTED: result.last_tested.isoformat(),
-            }
-        )
-        return attrs
+        }
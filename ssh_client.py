@@ -5,8 +5,10 @@ from __future__ import annotations
 import asyncio
 import logging
 import re
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache, partial
 
 import asyncssh
 
@@ -16,6 +18,9 @@ from .const import (
     CMD_CLI_EXIT,
     CMD_PORT_SHOW,
     CMD_SYSTEM_INFO,
+    SSH_KEEPALIVE_COUNT_MAX,
+    SSH_KEEPALIVE_INTERVAL,
+    SSH_MAX_CONNECTION_AGE,
     STATUS_FIBER,
     STATUS_NOT_TESTED,
     STATUS_OK,
@@ -26,34 +31,69 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
-
-@dataclass
+_LINK_RE = re.compile(r"\bU/([UD])\b")
+# Admin-disabled ports show no U/x link column; matched case-insensitively
+# without lowering a copy of every row
+_DISABLED_RE = re.compile(r"disabled", re.IGNORECASE)
+_RATE_RE = re.compile(r"\b(\d+)[FH]\b")
+_ANSI_ESCAPE_RE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+_MAC_RE = re.compile(r"([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}")
+# sh cable-diag rows: optional port header ("gi1 |") followed by an optional
+# "Pair A | length | status" result; always matches, with unused groups None
+_DIAG_LINE_RE = re.compile(
+    r"^(?:(?-i:gi)(\d+)\s*\|)?(?:.*?Pair\s+([A-D])\s*\|\s*([^\|]+)\s*\|\s*(.+)$)?",
+    re.IGNORECASE,
+)
+# Shell/CLI prompt at the end of the output read so far ("#" or ">")
+_PROMPT_RE = re.compile(r"[#>]\s*$")
+# Pair letter -> index into CableTestResult.statuses / lengths
+_PAIR_INDEX = {"A": 0, "B": 1, "C": 2, "D": 3}
+# Length cells for pairs the switch could not measure
+_NO_LENGTH = frozenset({"n/a", "na", "-", ""})
+
+# Lowercased cable-diag pair status -> normalized status
+_STATUS_MAP = {
+    "normal": STATUS_OK,
+    "ok": STATUS_OK,
+    "good": STATUS_OK,
+    "open": STATUS_OPEN,
+    "disconnect": STATUS_OPEN,
+    "disconnected": STATUS_OPEN,
+    "short": STATUS_SHORT,
+    "not supported": STATUS_NOT_TESTED,
+    "n/a": STATUS_NOT_TESTED,
+    "na": STATUS_NOT_TESTED,
+    "-": STATUS_NOT_TESTED,
+    "": STATUS_NOT_TESTED,
+}
+
+
+@dataclass(slots=True)
 class CableTestResult:
-    """Cable test result for a single port."""
+    """Cable test result for a single port.
+
+    Per-pair results are indexed 0-3 for pairs 1-4 (A-D).
+    """
 
     port: int
-    pair_1_status: str = STATUS_NOT_TESTED
-    pair_1_length: float | None = None
-    pair_2_status: str = STATUS_NOT_TESTED
-    pair_2_length: float | None = None
-    pair_3_status: str = STATUS_NOT_TESTED
-    pair_3_length: float | None = None
-    pair_4_status: str = STATUS_NOT_TESTED
-    pair_4_length: float | None = None
-    last_tested: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-
-
-@dataclass
+    statuses: list[str] = field(default_factory=lambda: [STATUS_NOT_TESTED] * 4)
+    lengths: list[float | None] = field(default_factory=lambda: [None] * 4)
+    # Parsers pass one shared timestamp per run; the default only covers
+    # results built elsewhere
+    last_tested: datetime = field(default_factory=partial(datetime.now, timezone.utc))
+
+
+@dataclass(slots=True)
 class SwitchInfo:
     """Information about the UniFi switch."""
 
     hostname: str = "UniFi Switch"
     model: str = "USW"
     version: str | None = None
-    mac: str | None = None
+    mac: str | None = None  # Always stored lowercase
 
 
-@dataclass
+@dataclass(slots=True)
 class PortStatus:
     """Current link status details for a switch port."""
 
@@ -81,7 +121,11 @@ class UniFiCommandError(UniFiSSHError):
 
 
 class UniFiSSHClient:
-    """Async SSH client for UniFi switches."""
+    """Async SSH client for UniFi switches.
+
+    A single SSH connection is kept open for the lifetime of the client and
+    every command runs in its own session channel over that connection.
+    """
 
     def __init__(
         self,
@@ -100,12 +144,25 @@ class UniFiSSHClient:
         self._ssh_key_path = ssh_key_path
         self._ssh_key_passphrase = ssh_key_passphrase
         self._conn: asyncssh.SSHClientConnection | None = None
+        # Private key, loaded on first connect and reused for reconnects
+        self._client_key: asyncssh.SSHKey | None = None
+        self._connected_at: float = 0.0
+        # Commands may run concurrently on separate channels; serialize
+        # (re)connecting so they don't each open their own connection
+        self._conn_lock = asyncio.Lock()
+        # A switch's port count never changes, so it is discovered once
+        self._port_count: int | None = None
 
     @property
     def host(self) -> str:
         """Return the host."""
         return self._host
 
+    @property
+    def connected(self) -> bool:
+        """Return True if the SSH connection is open."""
+        return self._conn is not None and not self._conn.is_closed()
+
     async def connect(self) -> None:
         """Establish SSH connection to the switch."""
         try:
@@ -114,21 +171,32 @@ class UniFiSSHClient:
                 "port": self._port,
                 "username": self._username,
                 "known_hosts": None,  # Accept any host key
+                # Keep the connection alive between requests so each button
+                # press or service call only opens a new session channel
+                # instead of repeating the TCP + key exchange handshake.
+                "keepalive_interval": SSH_KEEPALIVE_INTERVAL,
+                "keepalive_count_max": SSH_KEEPALIVE_COUNT_MAX,
             }
 
             if self._ssh_key_path:
-                client_keys = asyncssh.read_private_key(
-                    self._ssh_key_path,
-                    passphrase=self._ssh_key_passphrase or None,
-                )
-                kwargs["client_keys"] = [client_keys]
+                if self._client_key is None:
+                    # Key file I/O and decryption stay off the event loop
+                    loop = asyncio.get_running_loop()
+                    self._client_key = await loop.run_in_executor(
+                        None,
+                        partial(
+                            asyncssh.read_private_key,
+                            self._ssh_key_path,
+                            passphrase=self._ssh_key_passphrase or None,
+                        ),
+                    )
+                kwargs["client_keys"] = [self._client_key]
             elif self._password:
                 kwargs["password"] = self._password
 
-            self._conn = await asyncio.wait_for(
-                asyncssh.connect(**kwargs),
-                timeout=10,
-            )
+            async with asyncio.timeout(10):
+                self._conn = await asyncssh.connect(**kwargs)
+            self._connected_at = time.monotonic()
             _LOGGER.debug("Connected to %s:%s", self._host, self._port)
 
         except asyncssh.PermissionDenied as err:
@@ -158,36 +226,87 @@ class UniFiSSHClient:
 
     async def _ensure_connected(self) -> None:
         """Ensure we have an active SSH connection, reconnect if needed."""
-        if self._conn is None or self._conn.is_closed():
-            _LOGGER.debug("Reconnecting to %s", self._host)
-            await self.connect()
+        async with self._conn_lock:
+            if (
+                self.connected
+                and time.monotonic() - self._connected_at > SSH_MAX_CONNECTION_AGE
+            ):
+                _LOGGER.debug("Cycling SSH connection to %s after max age", self._host)
+                await self.disconnect()
+            if not self.connected:
+                _LOGGER.debug("Reconnecting to %s", self._host)
+                await self.connect()
+
+    def _drop_broken_connection(
+        self, err: Exception, conn: asyncssh.SSHClientConnection
+    ) -> None:
+        """Forget the connection a command failed on, unless it survived.
+
+        A timeout, or a channel that failed to open (e.g. the switch's session
+        limit), leaves the connection itself usable, so it is kept for the
+        next command and for other channels still running on it. If another
+        command has already replaced the connection, the new one is left
+        alone.
+        """
+        if isinstance(err, asyncio.TimeoutError):
+            return
+        if isinstance(err, asyncssh.ChannelOpenError) and not conn.is_closed():
+            return
+        conn.close()
+        if self._conn is conn:
+            self._conn = None
 
     async def run_command(self, command: str, timeout: int = 30) -> str:
-        """Execute a command on the switch and return stdout."""
-        await self._ensure_connected()
-        assert self._conn is not None
+        """Execute a command on the switch and return stdout.
 
+        If the kept-alive connection turns out to be broken, the command is
+        retried once on a fresh connection rather than failing the poll.
+        """
         try:
-            result = await asyncio.wait_for(
-                self._conn.run(command, check=False),
-                timeout=timeout,
-            )
-            output = result.stdout or ""
-            if result.stderr:
-                _LOGGER.debug("stderr from '%s': %s", command, result.stderr)
-            return output
+            try:
+                return await self._exec_command(command, timeout)
+            except asyncio.TimeoutError:
+                # A slow command doesn't mean the connection is broken, and
+                # TimeoutError is an OSError, so keep it out of the retry
+                raise
+            except (asyncssh.Error, OSError) as err:
+                _LOGGER.debug(
+                    "Command '%s' failed on %s, retrying on a new connection: %s",
+                    command,
+                    self._host,
+                    err,
+                )
+                return await self._exec_command(command, timeout)
 
         except asyncio.TimeoutError as err:
             raise UniFiCommandError(
                 f"Command '{command}' timed out after {timeout}s"
             ) from err
         except (asyncssh.Error, OSError) as err:
-            # Connection may be broken, clear it so next call reconnects
-            self._conn = None
             raise UniFiCommandError(
                 f"Command '{command}' failed: {err}"
             ) from err
 
+    async def _exec_command(self, command: str, timeout: int) -> str:
+        """Run a command over the current connection, connecting if needed.
+
+        A connection the command broke on is dropped before the error is
+        re-raised.
+        """
+        await self._ensure_connected()
+        conn = self._conn
+        assert conn is not None
+
+        try:
+            async with asyncio.timeout(timeout):
+                result = await conn.run(command, check=False)
+        except (asyncssh.Error, OSError) as err:
+            self._drop_broken_connection(err, conn)
+            raise
+        if result.stderr:
+            _LOGGER.debug("stderr from '%s': %s", command, result.stderr)
+        return result.stdout or ""
+
     async def run_shell_command(self, command: str, timeout: int = 30) -> str:
         """Execute a command in the UniFi interactive shell.
 
@@ -198,14 +317,15 @@ class UniFiSSHClient:
         interfere with the main SSH connection.
         """
         await self._ensure_connected()
-        assert self._conn is not None
+        conn = self._conn
+        assert conn is not None
 
         collected_output = ""
         process = None
 
         try:
             # Don't use async context manager - it hangs on wait_closed()
-            process = await self._conn.create_process(
+            process = await conn.create_process(
                 term_type="vt100",
                 encoding="utf-8",
             )
@@ -215,14 +335,13 @@ class UniFiSSHClient:
             await asyncio.sleep(0.5)
 
             # Read output with timeout
-            deadline = asyncio.get_event_loop().time() + timeout
+            now = asyncio.get_running_loop().time
+            deadline = now() + timeout
 
-            while asyncio.get_event_loop().time() < deadline:
+            while now() < deadline:
                 try:
-                    chunk = await asyncio.wait_for(
-                        process.stdout.read(4096),
-                        timeout=2.0,
-                    )
+                    async with asyncio.timeout(2.0):
+                        chunk = await process.stdout.read(4096)
                     if not chunk:
                         break
                     collected_output += chunk
@@ -243,7 +362,7 @@ class UniFiSSHClient:
                 f"Shell command '{command}' timed out after {timeout}s"
             ) from err
         except (asyncssh.Error, OSError) as err:
-            self._conn = None
+            self._drop_broken_connection(err, conn)
             raise UniFiCommandError(
                 f"Shell command '{command}' failed: {err}"
             ) from err
@@ -258,8 +377,12 @@ class UniFiSSHClient:
 
     async def get_port_count(self) -> int:
         """Discover the number of ports on the switch."""
-        output = await self.run_command(CMD_PORT_SHOW)
-        return self._parse_port_count(output)
+        if self._port_count is None:
+            output = await self.run_command(CMD_PORT_SHOW)
+            if port_count := self._parse_port_count(output):
+                self._port_count = port_count
+            return port_count
+        return self._port_count
 
     async def get_switch_info(self) -> SwitchInfo:
         """Get switch model and hostname information."""
@@ -278,7 +401,19 @@ class UniFiSSHClient:
     async def get_port_statuses(self) -> dict[int, PortStatus]:
         """Fetch and parse port link status details."""
         output = await self.run_command(CMD_PORT_SHOW)
-        return self._parse_port_statuses(output)
+        return self._parse_port_statuses(output, self._port_count or 0)
+
+    async def get_port_count_and_statuses(self) -> tuple[int, dict[int, PortStatus]]:
+        """Discover the port count and link details from one port listing."""
+        output = await self.run_command(CMD_PORT_SHOW)
+        statuses = self._parse_port_statuses(output)
+        # Every line counted by _parse_port_count yields a status entry
+        port_count = max(statuses, default=0)
+        if port_count == 0:
+            _LOGGER.warning("Could not determine port count from output: %s", output)
+        else:
+            self._port_count = port_count
+        return port_count, statuses
 
     async def run_cli_commands(self, commands: list[str], timeout: int = 60) -> str:
         """Execute multiple commands in a single CLI session.
@@ -295,54 +430,54 @@ class UniFiSSHClient:
         We do NOT send a third exit since that would close the SSH session.
         """
         await self._ensure_connected()
-        assert self._conn is not None
+        conn = self._conn
+        assert conn is not None
 
         _LOGGER.debug("Running CLI commands: %s", commands)
 
-        collected_output = ""
+        # Chunks are joined once at the end rather than concatenated per read
+        chunks: list[str] = []
         process = None
 
         try:
             # Don't use async context manager - it hangs on wait_closed()
-            process = await self._conn.create_process(
+            process = await conn.create_process(
                 term_type="vt100",
                 encoding="utf-8",
             )
 
-            # Enter CLI mode
+            # Enter CLI mode and wait for its prompt, since input typed
+            # before the CLI has started may be discarded
             process.stdin.write(f"{CMD_CLI_ENTER}\n")
-            await asyncio.sleep(1.0)  # CLI takes a moment to start
-
-            # Run all the cable test commands
-            for cmd in commands:
-                process.stdin.write(f"{cmd}\n")
-                await asyncio.sleep(0.5)
-
-            # Exit first CLI layer (goes to ">" prompt)
-            process.stdin.write(f"{CMD_CLI_EXIT}\n")
-            await asyncio.sleep(0.3)
+            chunks.append(
+                await self._read_until_prompt(process, CMD_CLI_ENTER, timeout=1.0)
+            )
 
-            # Exit second CLI layer (shows "Terminated", back at shell)
-            process.stdin.write(f"{CMD_CLI_EXIT}\n")
-            await asyncio.sleep(0.5)
+            # Queue all the cable test commands in one write; the CLI reads
+            # them from the terminal one line at a time as each completes.
+            # Then exit the first CLI layer (goes to ">" prompt) and the
+            # second (shows "Terminated", back at shell).
+            process.stdin.write(
+                "".join(
+                    f"{cmd}\n" for cmd in (*commands, CMD_CLI_EXIT, CMD_CLI_EXIT)
+                )
+            )
 
-            # Read output with timeout - look for "Terminated" marker
-            deadline = asyncio.get_event_loop().time() + timeout
+            # Read output line by line until the "Terminated" marker
+            now = asyncio.get_running_loop().time
+            deadline = now() + timeout
 
-            while asyncio.get_event_loop().time() < deadline:
+            while now() < deadline:
                 try:
-                    chunk = await asyncio.wait_for(
-                        process.stdout.read(4096),
-                        timeout=3.0,
-                    )
-                    if not chunk:
+                    async with asyncio.timeout(3.0):
+                        line = await process.stdout.readline()
+                    if not line:
                         _LOGGER.debug("EOF reached")
                         break
-                    collected_output += chunk
-                    _LOGGER.debug("Read chunk: %d bytes", len(chunk))
+                    chunks.append(line)
 
                     # Stop reading once we see "Terminated"
-                    if "Terminated" in collected_output:
+                    if "Terminated" in line:
                         _LOGGER.debug("Saw 'Terminated', done reading")
                         break
                 except asyncio.TimeoutError:
@@ -350,11 +485,13 @@ class UniFiSSHClient:
                     _LOGGER.debug("Read timeout, assuming complete")
                     break
 
+            collected_output = "".join(chunks)
             _LOGGER.debug("CLI output length: %d chars", len(collected_output))
             _LOGGER.debug("CLI output:\n%s", collected_output[:3000] if len(collected_output) > 3000 else collected_output)
             return collected_output
 
         except asyncio.TimeoutError as err:
+            collected_output = "".join(chunks)
             _LOGGER.debug("Final timeout, collected %d chars", len(collected_output))
             if collected_output:
                 return collected_output
@@ -362,7 +499,7 @@ class UniFiSSHClient:
                 f"CLI commands timed out after {timeout}s"
             ) from err
         except (asyncssh.Error, OSError) as err:
-            self._conn = None
+            self._drop_broken_connection(err, conn)
             raise UniFiCommandError(
                 f"CLI commands failed: {err}"
             ) from err
@@ -375,6 +512,42 @@ class UniFiSSHClient:
                 except Exception:
                     pass
 
+    @staticmethod
+    async def _read_until_prompt(
+        process: asyncssh.SSHClientProcess,
+        command: str,
+        timeout: float,
+    ) -> str:
+        """Read shell output until a prompt follows the echoed command line.
+
+        The prompt must come after the end of the line echoing the command,
+        so a prompt printed on the same line before the echo doesn't count.
+        Returns whatever was read if no prompt appears within the timeout.
+        """
+        output = ""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                async with asyncio.timeout(remaining):
+                    chunk = await process.stdout.read(4096)
+            except asyncio.TimeoutError:
+                _LOGGER.debug("No prompt after '%s' within %.1fs", command, timeout)
+                break
+            if not chunk:
+                break
+            output += chunk
+
+            echo_at = output.rfind(command)
+            if echo_at == -1:
+                continue
+            line_end = output.find("\n", echo_at + len(command))
+            if line_end != -1 and _PROMPT_RE.search(output, line_end):
+                break
+
+        return output
+
     async def run_cable_test(
         self,
         port: int | None = None,
@@ -408,20 +581,17 @@ class UniFiSSHClient:
         )
         output = await self.run_cli_commands(commands, timeout=timeout)
         _LOGGER.debug("Cable test raw output length: %d chars", len(output))
-        return self._parse_cable_diag_output(output)
+        return self._parse_cable_diag_output(output, expected_ports=len(commands))
 
     @staticmethod
     def _parse_port_count(output: str) -> int:
         """Parse swctrl port show output to find number of ports."""
         max_port = 0
-        for line in output.strip().splitlines():
-            line = line.strip()
+        for line in output.splitlines():
             # Look for lines starting with a port number (with optional U prefix)
             # Examples: "1  U/U", "14  U/D", "U24  U/U"
-            match = re.match(r"^U?(\d+)\s+", line)
-            if match:
-                port_num = int(match.group(1))
-                max_port = max(max_port, port_num)
+            if row := _split_port_line(line):
+                max_port = max(max_port, row[0])
 
         if max_port == 0:
             _LOGGER.warning("Could not determine port count from output: %s", output)
@@ -433,16 +603,16 @@ class UniFiSSHClient:
         info = SwitchInfo()
 
         # Clean ANSI escape codes from terminal output
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        output = ansi_escape.sub('', output)
+        output = _ANSI_ESCAPE_RE.sub("", output)
 
         def _value_after_delim(text: str) -> str | None:
             for delim in (":", "="):
-                if delim in text:
-                    return text.split(delim, 1)[1].strip()
+                _, sep, value = text.partition(delim)
+                if sep:
+                    return value.strip()
             return None
 
-        for line in output.strip().splitlines():
+        for line in output.splitlines():
             line = line.strip()
             if not line:
                 continue
@@ -466,30 +636,28 @@ class UniFiSSHClient:
                 if value:
                     info.version = value
             elif "mac" in lower:
-                mac_match = re.search(
-                    r"([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}",
-                    line,
-                )
+                mac_match = _MAC_RE.search(line)
                 if mac_match:
                     info.mac = mac_match.group(0).replace("-", ":").lower()
                 elif value:
                     # Rejoin after first delimiter for uncommon formats
-                    normalized = re.search(
-                        r"([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}",
-                        value,
-                    )
+                    normalized = _MAC_RE.search(value)
                     if normalized:
                         info.mac = normalized.group(0).replace("-", ":").lower()
                     else:
-                        info.mac = value
+                        info.mac = value.lower()
 
         _LOGGER.debug("Parsed switch info: %s", info)
         return info
 
     @staticmethod
-    def _parse_port_statuses(output: str) -> dict[int, PortStatus]:
+    def _parse_port_statuses(
+        output: str, expected_ports: int = 0
+    ) -> dict[int, PortStatus]:
         """Parse swctrl port show output into per-port status details.
 
+        Parsing stops once expected_ports ports have been read, if given.
+
         Example output format:
            1  U/U    100F  104575713   46802349 ...
           14  U/D      0H          0          0 ...
@@ -501,33 +669,28 @@ class UniFiSSHClient:
         """
         statuses: dict[int, PortStatus] = {}
 
-        for line in output.strip().splitlines():
-            raw = line.strip()
-            if not raw:
-                continue
-
+        for line in output.splitlines():
             # Match port number (with optional U prefix for uplink ports)
             # Examples: "1", "14", "U24"
-            match = re.match(r"^U?(\d+)\s+(.*)", raw)
-            if not match:
+            row = _split_port_line(line)
+            if row is None:
                 continue
 
-            port = int(match.group(1))
-            rest = match.group(2)
+            port, rest = row
 
             # Parse link status: U/U = connected, U/D = disconnected
             connected: bool | None = None
-            link_match = re.search(r"\bU/([UD])\b", rest)
+            link_match = _LINK_RE.search(rest)
             if link_match:
                 connected = link_match.group(1) == "U"
-            elif "disabled" in rest.lower():
+            elif _DISABLED_RE.search(rest):
                 connected = False
 
             # Parse rate: 100F, 1000F, 0H, etc.
             # The number is the speed in Mbps, letter is duplex (F=Full, H=Half)
             speed_mbps: int | None = None
             speed_display: str | None = None
-            rate_match = re.search(r"\b(\d+)[FH]\b", rest)
+            rate_match = _RATE_RE.search(rest)
             if rate_match:
                 speed_mbps = int(rate_match.group(1))
                 if speed_mbps == 0:
@@ -548,13 +711,20 @@ class UniFiSSHClient:
                 speed_display=speed_display,
                 port_type=port_type,
             )
+            if len(statuses) == expected_ports:
+                break
 
         return statuses
 
     @staticmethod
-    def _parse_cable_diag_output(output: str) -> dict[int, CableTestResult]:
+    def _parse_cable_diag_output(
+        output: str, expected_ports: int = 0
+    ) -> dict[int, CableTestResult]:
         """Parse CLI 'sh cable-diag' output into structured results.
 
+        Parsing stops after pair D of the last expected port, if
+        expected_ports is given.
+
         Example output format:
         Port   |  Speed | Local pair | Pair length | Pair status
         --------+--------+------------+-------------+---------------
@@ -566,7 +736,7 @@ class UniFiSSHClient:
         Status values: Normal=OK, Open, Short, Not Supported=N/A
         """
         results: dict[int, CableTestResult] = {}
-        lines = output.strip().splitlines()
+        lines = output.splitlines()
         now = datetime.now(timezone.utc)
 
         _LOGGER.debug("Parsing cable diag output, %d lines", len(lines))
@@ -579,18 +749,21 @@ class UniFiSSHClient:
         current_result: CableTestResult | None = None
 
         for line in lines:
-            line = line.strip()
-            if not line:
+            # Port headers and pair rows are column-separated; skip blank,
+            # separator, echo and prompt lines before stripping or matching
+            if "|" not in line:
                 continue
+            line = line.strip()
 
-            # Skip header and separator lines
-            if line.startswith(("-", "=", "Port")) or "--------" in line:
-                continue
+            # One pass decides whether this is a port header, a pair row,
+            # or both (the first pair shares the "gi1 |" line). Header and
+            # separator lines match with every group empty.
+            gi_port, pair_letter, length_str, status_str = _DIAG_LINE_RE.match(
+                line
+            ).groups()
 
-            # Check if this line starts with a port identifier (gi1, gi2, etc.)
-            port_match = re.match(r"gi(\d+)\s*\|", line)
-            if port_match:
-                current_port = int(port_match.group(1))
+            if gi_port is not None:
+                current_port = int(gi_port)
                 current_result = CableTestResult(port=current_port, last_tested=now)
                 results[current_port] = current_result
                 _LOGGER.debug("Found port %d in line: %s", current_port, line[:60])
@@ -598,10 +771,7 @@ class UniFiSSHClient:
                 # Check if this is a fiber port (line contains "Fiber" after the port)
                 if "fiber" in line.lower():
                     # Mark all pairs as Fiber - no cable test possible
-                    current_result.pair_1_status = STATUS_FIBER
-                    current_result.pair_2_status = STATUS_FIBER
-                    current_result.pair_3_status = STATUS_FIBER
-                    current_result.pair_4_status = STATUS_FIBER
+                    current_result.statuses = [STATUS_FIBER] * 4
                     _LOGGER.debug("Port %d is fiber", current_port)
                     continue
 
@@ -610,15 +780,10 @@ class UniFiSSHClient:
 
             # Parse pair data from this line
             # Look for: Pair [A-D] | length | status
-            pair_match = re.search(
-                r"Pair\s+([A-D])\s*\|\s*([^\|]+)\s*\|\s*(.+)$",
-                line,
-                re.IGNORECASE,
-            )
-            if pair_match:
-                pair_letter = pair_match.group(1).upper()
-                length_str = pair_match.group(2).strip()
-                status_str = pair_match.group(3).strip()
+            if pair_letter is not None:
+                pair_letter = pair_letter.upper()
+                length_str = length_str.strip()
+                status_str = status_str.strip()
 
                 _LOGGER.debug(
                     "Port %d Pair %s: length=%s status=%s",
@@ -626,23 +791,19 @@ class UniFiSSHClient:
                 )
 
                 # Map pair letter to index
-                pair_index = {"A": 1, "B": 2, "C": 3, "D": 4}.get(pair_letter)
+                pair_index = _PAIR_INDEX.get(pair_letter)
                 if pair_index is None:
                     continue
 
-                # Parse length
-                length: float | None = None
-                if length_str.lower() not in ("n/a", "na", "-", ""):
-                    try:
-                        length = float(length_str)
-                    except ValueError:
-                        pass
-
-                # Normalize status
-                status = _normalize_cable_status(status_str)
-
                 # Set the pair result
-                _set_pair_result(current_result, pair_index, status, length)
+                current_result.statuses[pair_index] = _normalize_cable_status(
+                    status_str
+                )
+                current_result.lengths[pair_index] = _parse_cable_length(length_str)
+
+                # Pair D is the last row for a port
+                if pair_index == 3 and len(results) == expected_ports:
+                    break
 
         _LOGGER.debug("Parsed %d port results", len(results))
         if not results:
@@ -651,36 +812,36 @@ class UniFiSSHClient:
         return results
 
 
+def _split_port_line(line: str) -> tuple[int, str] | None:
+    """Split a swctrl port row into its port number and the rest of the line.
+
+    Returns None for blank, header and separator lines. Leading whitespace
+    needn't be stripped first.
+    """
+    parts = line.split(None, 1)
+    if len(parts) != 2:
+        return None
+    head = parts[0]
+    # Uplink ports carry a U prefix (U24 = uplink port 24)
+    if head[0] == "U":
+        head = head[1:]
+    if not head.isdecimal():
+        return None
+    return int(head), parts[1]
+
+
 def _normalize_cable_status(status: str) -> str:
     """Normalize a cable status string from CLI output."""
-    status = status.strip().lower()
-    if status in ("normal", "ok", "good"):
-        return STATUS_OK
-    if status in ("open", "disconnect", "disconnected"):
-        return STATUS_OPEN
-    if status in ("short",):
-        return STATUS_SHORT
-    if status in ("not supported", "n/a", "na", "-", ""):
-        return STATUS_NOT_TESTED
-    return STATUS_UNKNOWN
-
-
-def _set_pair_result(
-    result: CableTestResult,
-    pair_index: int,
-    status: str,
-    length: float | None,
-) -> None:
-    """Set result values for a specific cable pair index."""
-    if pair_index == 1:
-        result.pair_1_status = status
-        result.pair_1_length = length
-    elif pair_index == 2:
-        result.pair_2_status = status
-        result.pair_2_length = length
-    elif pair_index == 3:
-        result.pair_3_status = status
-        result.pair_3_length = length
-    elif pair_index == 4:
-        result.pair_4_status = status
-        result.pair_4_length = length
+    return _STATUS_MAP.get(status.strip().lower(), STATUS_UNKNOWN)
+
+
+@lru_cache(maxsize=256)
+def _parse_cable_length(length: str) -> float | None:
+    """Parse a cable-diag pair length in meters, None if not reported."""
+    length = length.lower()
+    if length in _NO_LENGTH:
+        return None
+    try:
+        return float(length.removesuffix("m"))
+    except ValueError:
+        return None
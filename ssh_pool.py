@@ -0,0 +1,162 @@
+"""Shared pool of idle SSH clients for UniFi switches.
+
+The config flow validates credentials by connecting to the switch, and the
+integration connects again moments later when the entry is set up. Instead of
+tearing the validation connection down, it is parked here for a short time so
+the config entry (or a retried wizard step) can pick it up without repeating
+the TCP and key exchange handshake.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager, suppress
+import hashlib
+import logging
+from typing import Any
+from weakref import WeakValueDictionary
+
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_PORT, CONF_USERNAME
+
+from .const import (
+    AUTH_METHOD_KEY,
+    CONF_AUTH_METHOD,
+    CONF_SSH_KEY_PASSPHRASE,
+    CONF_SSH_KEY_PATH,
+    DEFAULT_SSH_PORT,
+    DEFAULT_USERNAME,
+)
+from .ssh_client import UniFiSSHClient
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long an idle connection is kept before it is closed
+IDLE_TTL = 60.0
+
+# Upper bound on a background disconnect, so a switch that never completes the
+# TCP teardown cannot leave tasks piling up
+DISCONNECT_TIMEOUT = 5.0
+
+PoolKey = tuple[str, int, str, str]
+
+_idle: dict[PoolKey, tuple[UniFiSSHClient, asyncio.TimerHandle]] = {}
+# Held only while a borrower is using or waiting on a key, so entries for
+# rejected credentials disappear instead of accumulating
+_locks: WeakValueDictionary[PoolKey, asyncio.Lock] = WeakValueDictionary()
+_closing: set[asyncio.Task] = set()
+
+
+def create_client(data: Mapping[str, Any]) -> UniFiSSHClient:
+    """Create an SSH client from config entry data."""
+    kwargs: dict = {
+        "host": data[CONF_HOST],
+        "port": data.get(CONF_PORT, DEFAULT_SSH_PORT),
+        "username": data.get(CONF_USERNAME, DEFAULT_USERNAME),
+    }
+
+    if data.get(CONF_AUTH_METHOD) == AUTH_METHOD_KEY:
+        kwargs["ssh_key_path"] = data.get(CONF_SSH_KEY_PATH)
+        kwargs["ssh_key_passphrase"] = data.get(CONF_SSH_KEY_PASSPHRASE) or None
+    else:
+        kwargs["password"] = data.get(CONF_PASSWORD)
+
+    return UniFiSSHClient(**kwargs)
+
+
+def pool_key(data: Mapping[str, Any]) -> PoolKey:
+    """Return the pool key for a set of connection details.
+
+    Auth material is hashed so secrets are never kept in the key itself.
+    """
+    if data.get(CONF_AUTH_METHOD) == AUTH_METHOD_KEY:
+        secret = "\0".join(
+            (
+                AUTH_METHOD_KEY,
+                data.get(CONF_SSH_KEY_PATH) or "",
+                data.get(CONF_SSH_KEY_PASSPHRASE) or "",
+            )
+        )
+    else:
+        secret = "\0".join((CONF_PASSWORD, data.get(CONF_PASSWORD) or ""))
+
+    return (
+        data[CONF_HOST],
+        data.get(CONF_PORT, DEFAULT_SSH_PORT),
+        data.get(CONF_USERNAME, DEFAULT_USERNAME),
+        hashlib.blake2b(secret.encode(), digest_size=16).hexdigest(),
+    )
+
+
+def take(data: Mapping[str, Any]) -> UniFiSSHClient:
+    """Take ownership of a pooled client, or create a new one.
+
+    The caller becomes responsible for disconnecting the returned client.
+    """
+    return _pop_idle(pool_key(data)) or create_client(data)
+
+
+@asynccontextmanager
+async def acquire(data: Mapping[str, Any]) -> AsyncIterator[UniFiSSHClient]:
+    """Borrow a client for the given connection details.
+
+    The client is returned to the pool on success and disconnected if the
+    block raises, so a broken connection is never handed out again.
+    """
+    key = pool_key(data)
+    if (lock := _locks.get(key)) is None:
+        lock = _locks[key] = asyncio.Lock()
+
+    async with lock:
+        client = _pop_idle(key) or create_client(data)
+        try:
+            yield client
+        except BaseException:
+            _disconnect_in_background(client)
+            raise
+        _release(key, client)
+
+
+def _pop_idle(key: PoolKey) -> UniFiSSHClient | None:
+    """Remove and return an idle client for a key, if any."""
+    if (idle := _idle.pop(key, None)) is None:
+        return None
+    client, expiry = idle
+    expiry.cancel()
+    _LOGGER.debug("Reusing pooled SSH connection to %s", client.host)
+    return client
+
+
+def _release(key: PoolKey, client: UniFiSSHClient) -> None:
+    """Park a client in the pool until it expires."""
+    if not client.connected:
+        return
+    if key in _idle:
+        # Already holding a warm connection for this switch
+        _disconnect_in_background(client)
+        return
+    expiry = asyncio.get_running_loop().call_later(IDLE_TTL, _expire, key)
+    _idle[key] = (client, expiry)
+
+
+def _expire(key: PoolKey) -> None:
+    """Close an idle client whose time-to-live has elapsed."""
+    if (idle := _idle.pop(key, None)) is None:
+        return
+    client, _ = idle
+    _LOGGER.debug("Closing idle pooled SSH connection to %s", client.host)
+    _disconnect_in_background(client)
+
+
+def _disconnect_in_background(client: UniFiSSHClient) -> None:
+    """Close a client without making the caller wait for the TCP teardown."""
+    task = asyncio.get_running_loop().create_task(_disconnect(client))
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+async def _disconnect(client: UniFiSSHClient) -> None:
+    """Disconnect a client, giving up after DISCONNECT_TIMEOUT."""
+    with suppress(Exception):
+        async with asyncio.timeout(DISCONNECT_TIMEOUT):
+            await client.disconnect()